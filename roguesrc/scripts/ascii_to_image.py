@@ -1,5 +1,8 @@
 from PIL import Image, ImageDraw
 import os
+import sys
+
+from indexed_png import save_indexed_png
 
 # Constants from drawUtil.cs
 SIDE_PADDING = 8
@@ -21,8 +24,8 @@ def get_char_rect(char_num):
 
 def draw_char(draw, char_num, x, y):
     """Draw a CP437 character at the specified position."""
-    # Load the CP437 charset
-    charset = Image.open('../RogueLib/images/Codepage-437-transparent.png')
+    # Load the CP437 charset (as RGBA, since the sheet may be stored as a palette PNG)
+    charset = Image.open('../RogueLib/images/Codepage-437-transparent.png').convert('RGBA')
     
     # Get the character from the charset
     char_rect = get_char_rect(char_num)
@@ -31,7 +34,14 @@ def draw_char(draw, char_num, x, y):
     # Paste the character onto the target image
     draw.bitmap((x, y), char_img)
 
-def create_skull_image():
+def save_image(image, output_path, indexed):
+    """Save an image as RGBA, or as a palette PNG with the same pixels if indexed."""
+    if indexed:
+        save_indexed_png(image, output_path)
+    else:
+        image.save(output_path)
+
+def create_skull_image(indexed=False):
     # Read the skull pattern from file
     with open('data/skull.txt', 'r') as f:
         skull_lines = f.readlines()
@@ -69,10 +79,10 @@ def create_skull_image():
     
     # Save the image
     output_path = '../RogueLib/images/skull.png'
-    image.save(output_path)
+    save_image(image, output_path, indexed)
     print(f"Skull image saved to {output_path}")
 
-def create_sword_image():
+def create_sword_image(indexed=False):
     # Read the sword pattern from file
     with open('data/sword.txt', 'r') as f:
         sword_lines = f.readlines()
@@ -106,9 +116,11 @@ def create_sword_image():
     
     # Save the image
     output_path = '../RogueLib/images/sword.png'
-    image.save(output_path)
+    save_image(image, output_path, indexed)
     print(f"Sword image saved to {output_path}")
 
 if __name__ == "__main__":
-    create_skull_image()
-    create_sword_image() 
\ No newline at end of file
+    # Pass --indexed to write small palette PNGs instead of 32-bit RGBA
+    indexed = '--indexed' in sys.argv[1:]
+    create_skull_image(indexed)
+    create_sword_image(indexed) 
\ No newline at end of file
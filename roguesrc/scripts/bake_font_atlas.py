@@ -0,0 +1,255 @@
+from PIL import Image, ImageDraw, ImageFont, features
+import argparse
+import json
+import sys
+
+# fontTools reads kerning straight from the font's GPOS table; without it the
+# kerning has to be measured through Pillow's Raqm layout engine
+try:
+    from fontTools.ttLib import TTFont
+except ImportError:
+    TTFont = None
+
+# Font shipped with the game
+FONT_PATH = '../RogueLib/fonts/Roboto-Regular.ttf'
+
+# Output atlas texture and metrics table
+ATLAS_PATH = '../RogueLib/fonts/Roboto-Regular-atlas.png'
+METRICS_PATH = '../RogueLib/fonts/Roboto-Regular-atlas.json'
+
+# Sizes drawn with MenuFont by the presenters: DescriptionSize (20), the banner (24),
+# ScreenConstants.MenuFontSize / EnemyNameSize / shop title (32) and TitleSize (48)
+DEFAULT_SIZES = [20, 24, 32, 48]
+
+# Printable ASCII, the same set raylib's LoadFont rasterises by default
+DEFAULT_CODEPOINTS = list(range(32, 127))
+
+ATLAS_WIDTH = 1024
+GLYPH_PADDING = 1
+
+def measure_glyphs(font, codepoints):
+    """
+    Measure every glyph of a font at one size.
+
+    Width and height are those of the inked pixels, so the atlas holds no blank
+    side bearings. Offsets follow raylib's GlyphInfo: offset_x is the left bearing
+    (from the pen position to the first inked column) and offset_y is the distance
+    from the top of the line (the ascent) to the first inked row.
+    """
+    ascent, descent = font.getmetrics()
+    glyphs = []
+    for codepoint in codepoints:
+        char = chr(codepoint)
+
+        # getbbox gives the advance box with the basic layout engine, so take the
+        # ink box from the rendered mask instead, relative to the baseline origin
+        mask, (mask_left, mask_top) = font.getmask2(char, anchor='ls')
+        ink = mask.getbbox()
+        if ink is None:
+            left = top = right = bottom = 0
+        else:
+            left, top = mask_left + ink[0], mask_top + ink[1]
+            right, bottom = mask_left + ink[2], mask_top + ink[3]
+
+        glyphs.append({
+            'codepoint': codepoint,
+            'width': right - left,
+            'height': bottom - top,
+            'offset_x': left,
+            'offset_y': ascent + top,
+            'advance': round(font.getlength(char)),
+            'ink_left': left,
+            'ink_top': top
+        })
+    return ascent, descent, glyphs
+
+def measure_kerning(font, codepoints):
+    """
+    Find the kerning of every glyph pair, as the difference between the pair's
+    advance and the sum of the single advances. Pairs without kerning are skipped.
+
+    Needs the Raqm layout engine, since Roboto only has GPOS kerning. Ligatures
+    are turned off so that they aren't mistaken for kerning.
+    """
+    advances = {codepoint: font.getlength(chr(codepoint), features=['-liga']) for codepoint in codepoints}
+    kerning = []
+    for left in codepoints:
+        for right in codepoints:
+            pair_length = font.getlength(chr(left) + chr(right), features=['-liga'])
+            amount = round(pair_length - advances[left] - advances[right])
+            if amount != 0:
+                kerning.append([left, right, amount])
+    return kerning
+
+def read_gpos_kerning(font_path, codepoints, script='latn'):
+    """
+    Read the kerning of every glyph pair from the font's GPOS 'kern' lookups.
+
+    Returns:
+        tuple: (units per em, dict of (left, right) codepoints to kerning in font units)
+    """
+    font = TTFont(font_path)
+    units_per_em = font['head'].unitsPerEm
+    if 'GPOS' not in font:
+        return units_per_em, {}
+    gpos = font['GPOS'].table
+    glyph_names = font.getBestCmap()
+
+    # Lookups of the 'kern' feature for the script, falling back to the default script
+    scripts = {record.ScriptTag: record.Script for record in gpos.ScriptList.ScriptRecord}
+    script_table = scripts.get(script) or scripts.get('DFLT')
+    lookup_indices = []
+    if script_table is not None and script_table.DefaultLangSys is not None:
+        for feature_index in script_table.DefaultLangSys.FeatureIndex:
+            feature_record = gpos.FeatureList.FeatureRecord[feature_index]
+            if feature_record.FeatureTag == 'kern':
+                lookup_indices.extend(feature_record.Feature.LookupListIndex)
+
+    # Pair adjustment subtables, unwrapping extension lookups
+    lookups = []
+    for lookup_index in sorted(set(lookup_indices)):
+        lookup = gpos.LookupList.Lookup[lookup_index]
+        subtables = [subtable.ExtSubTable if lookup.LookupType == 9 else subtable for subtable in lookup.SubTable]
+        lookups.append([subtable for subtable in subtables if subtable.LookupType == 2])
+
+    pairs = {}
+    names = {codepoint: glyph_names[codepoint] for codepoint in codepoints if codepoint in glyph_names}
+    for left, left_name in names.items():
+        for right, right_name in names.items():
+            # Each lookup applies its first subtable that covers the pair
+            amount = 0
+            for subtables in lookups:
+                for subtable in subtables:
+                    value = get_pair_adjustment(subtable, left_name, right_name)
+                    if value is not None:
+                        amount += value
+                        break
+            if amount != 0:
+                pairs[(left, right)] = amount
+
+    return units_per_em, pairs
+
+def get_pair_adjustment(subtable, left_name, right_name):
+    """Get the advance adjustment of a PairPos subtable for a glyph pair, or None if it doesn't apply"""
+    if left_name not in subtable.Coverage.glyphs:
+        return None
+
+    if subtable.Format == 1:
+        pair_set = subtable.PairSet[subtable.Coverage.glyphs.index(left_name)]
+        for record in pair_set.PairValueRecord:
+            if record.SecondGlyph == right_name:
+                return getattr(record.Value1, 'XAdvance', 0) or 0
+        return None
+
+    left_class = subtable.ClassDef1.classDefs.get(left_name, 0)
+    right_class = subtable.ClassDef2.classDefs.get(right_name, 0)
+    record = subtable.Class1Record[left_class].Class2Record[right_class]
+    return getattr(record.Value1, 'XAdvance', 0) or 0
+
+def pack_glyphs(glyphs, atlas_width):
+    """
+    Place glyphs on shelves, tallest first, and return the atlas height.
+    Sets 'x' and 'y' on every glyph.
+    """
+    x = y = shelf_height = 0
+    for glyph in sorted(glyphs, key=lambda glyph: glyph['height'], reverse=True):
+        width = glyph['width'] + GLYPH_PADDING * 2
+        height = glyph['height'] + GLYPH_PADDING * 2
+
+        # Start a new shelf when this one is full
+        if x + width > atlas_width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+
+        glyph['x'] = x + GLYPH_PADDING
+        glyph['y'] = y + GLYPH_PADDING
+        x += width
+        shelf_height = max(shelf_height, height)
+
+    return y + shelf_height
+
+def bake_font_atlas(font_path=FONT_PATH, sizes=DEFAULT_SIZES, codepoints=DEFAULT_CODEPOINTS, atlas_width=ATLAS_WIDTH):
+    """
+    Rasterise the glyphs of a font at several sizes into one atlas.
+
+    Returns:
+        tuple: (RGBA atlas image, metrics dict)
+    """
+    # Roboto keeps its kerning in GPOS, which the basic layout engine ignores, so
+    # read it with fontTools or measure it with Raqm
+    if TTFont is None and not features.check('raqm'):
+        raise RuntimeError("Kerning needs either fontTools (pip install fonttools) or Pillow with Raqm")
+
+    if TTFont is not None:
+        units_per_em, gpos_kerning = read_gpos_kerning(font_path, codepoints)
+        layout_engine = ImageFont.Layout.BASIC
+    else:
+        layout_engine = ImageFont.Layout.RAQM
+
+    fonts = {size: ImageFont.truetype(font_path, size, layout_engine=layout_engine) for size in sizes}
+    metrics = {size: measure_glyphs(fonts[size], codepoints) for size in sizes}
+
+    # Pack the glyphs of all sizes together so the game loads a single texture
+    all_glyphs = [(size, glyph) for size in sizes for glyph in metrics[size][2]]
+    atlas_height = pack_glyphs([glyph for _, glyph in all_glyphs], atlas_width)
+
+    # Draw coverage into a greyscale image and use it as the alpha of a white
+    # texture, so the game can tint glyphs with any colour
+    coverage = Image.new('L', (atlas_width, atlas_height), 0)
+    draw = ImageDraw.Draw(coverage)
+    for size, glyph in all_glyphs:
+        if glyph['width'] and glyph['height']:
+            draw.text((glyph['x'] - glyph['ink_left'], glyph['y'] - glyph['ink_top']),
+                      chr(glyph['codepoint']), font=fonts[size], fill=255, anchor='ls')
+
+    atlas = Image.new('RGBA', (atlas_width, atlas_height), (255, 255, 255, 0))
+    atlas.putalpha(coverage)
+
+    table = {
+        'texture': ATLAS_PATH.split('/')[-1],
+        'glyph_padding': GLYPH_PADDING,
+        'sizes': []
+    }
+    for size in sizes:
+        ascent, descent, glyphs = metrics[size]
+        if TTFont is not None:
+            # Scale font units to pixels the way FreeType does for advances
+            kerning = [[left, right, round(amount * size / units_per_em)]
+                       for (left, right), amount in sorted(gpos_kerning.items())]
+            kerning = [pair for pair in kerning if pair[2] != 0]
+        else:
+            kerning = measure_kerning(fonts[size], codepoints)
+
+        table['sizes'].append({
+            'size': size,
+            'ascent': ascent,
+            'descent': descent,
+            'line_height': ascent + descent,
+            'glyphs': [{key: glyph[key] for key in ('codepoint', 'x', 'y', 'width', 'height',
+                                                    'offset_x', 'offset_y', 'advance')}
+                       for glyph in glyphs],
+            'kerning': kerning
+        })
+
+    return atlas, table
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-render Roboto glyphs into a texture atlas and metrics table")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Font sizes in pixels")
+    parser.add_argument('--extra-chars', default='', help="Characters to bake in addition to printable ASCII")
+    args = parser.parse_args()
+
+    codepoints = sorted(set(DEFAULT_CODEPOINTS) | {ord(char) for char in args.extra_chars})
+    try:
+        atlas, table = bake_font_atlas(sizes=args.sizes, codepoints=codepoints)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    atlas.save(ATLAS_PATH, optimize=True)
+    print(f"Font atlas saved to {ATLAS_PATH} ({atlas.width}x{atlas.height})")
+
+    with open(METRICS_PATH, 'w') as f:
+        json.dump(table, f, separators=(',', ':'))
+    print(f"Font metrics saved to {METRICS_PATH}")
@@ -0,0 +1,294 @@
+from collections import OrderedDict
+
+from map_gen import InfiniteRogueMap, WALKABLE_TILES
+
+# Number of field of view results kept before the least recently used are dropped
+DEFAULT_CACHE_SIZE = 4096
+
+# Multipliers that map the first octant onto each of the eight octants
+# (xx, xy, yx, yy), as used by recursive shadowcasting
+OCTANTS = [
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1)
+]
+
+
+class FieldOfView:
+    """
+    Field of view and line of sight over an InfiniteRogueMap using recursive shadowcasting.
+    Opacity is stored per chunk as one bitmask per row, and results are cached until
+    one of the chunks they looked at changes.
+    """
+
+    def __init__(self, infinite_map, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Initialize the field of view for a map.
+
+        Args:
+            infinite_map: InfiniteRogueMap to look at
+            cache_size (int): Number of field of view results to keep
+        """
+        self.map = infinite_map
+        self.cache_size = cache_size
+        self.opacity_cache = {}  # Row bitmasks by section, bit i set if column i is opaque
+        self.fov_cache = OrderedDict()  # (visible positions, sections) by (x, y, radius), LRU order
+        self.fov_keys_by_section = {}  # Cached FOV keys that depend on each section
+
+        # Hear about chunks changed by hallway generation. The map only holds a
+        # weak reference, so dropping the FieldOfView unregisters it.
+        infinite_map.add_chunk_listener(self)
+
+    def tracked_chunks(self):
+        """Get the sections whose opacity is cached, the only ones worth updating"""
+        return self.opacity_cache.keys()
+
+    def update_chunk(self, section_key, tiles):
+        """
+        Refresh the opacity of a chunk and drop cached results that depended on it.
+
+        Args:
+            section_key: (section_x, section_y) of the chunk
+            tiles: Map of (x, y) to tile character covering the chunk
+        """
+        # Chunks nobody has looked at yet are built lazily when needed
+        if section_key not in self.opacity_cache:
+            return
+
+        masks = self._build_masks(section_key, tiles.get)
+        if masks == self.opacity_cache[section_key]:
+            return
+
+        self.opacity_cache[section_key] = masks
+        for fov_key in list(self.fov_keys_by_section.get(section_key, ())):
+            self._forget_fov(fov_key)
+
+    def _forget_fov(self, fov_key):
+        """Drop a cached result and its entries in the per-section index"""
+        _, sections = self.fov_cache.pop(fov_key)
+        for section_key in sections:
+            fov_keys = self.fov_keys_by_section[section_key]
+            fov_keys.discard(fov_key)
+            if not fov_keys:
+                del self.fov_keys_by_section[section_key]
+
+    def _build_masks(self, section_key, get_tile):
+        """
+        Build the opacity bitmasks for a chunk.
+
+        Args:
+            section_key: (section_x, section_y) of the chunk
+            get_tile: Function taking (x, y) and returning the tile character
+
+        Returns:
+            tuple: One int per row, bit i set if the tile in column i is opaque
+        """
+        chunk_size = self.map.CHUNK_SIZE
+        base_x = section_key[0] * chunk_size
+        base_y = section_key[1] * chunk_size
+
+        masks = []
+        for y in range(base_y, base_y + chunk_size):
+            mask = 0
+            for i in range(chunk_size):
+                if get_tile((base_x + i, y)) not in WALKABLE_TILES:
+                    mask |= 1 << i
+            masks.append(mask)
+        return tuple(masks)
+
+    def _get_masks(self, section_key):
+        """Get the opacity bitmasks for a chunk, building them if needed"""
+        masks = self.opacity_cache.get(section_key)
+        if masks is None:
+            masks = self._build_masks(section_key, lambda pos: self.map.get_tile(*pos))
+            self.opacity_cache[section_key] = masks
+        return masks
+
+    def is_opaque(self, x, y):
+        """Check if a tile blocks sight"""
+        chunk_size = self.map.CHUNK_SIZE
+        masks = self._get_masks((x // chunk_size, y // chunk_size))
+        return (masks[y % chunk_size] >> (x % chunk_size)) & 1 == 1
+
+    def compute_fov(self, x, y, radius):
+        """
+        Get every tile visible from a position.
+
+        Args:
+            x, y: Observer position
+            radius (int): Maximum sight distance
+
+        Returns:
+            frozenset: Set of visible (x, y) positions, including the observer
+        """
+        fov_key = (x, y, radius)
+        cached = self.fov_cache.get(fov_key)
+        if cached is not None:
+            self.fov_cache.move_to_end(fov_key)
+            return cached[0]
+
+        # Look up every mask in range once instead of per tile
+        sections = self._get_sections_in_radius(x, y, radius)
+        masks = {section_key: self._get_masks(section_key) for section_key in sections}
+        return self._compute_uncached_fov(x, y, radius, sections, masks)
+
+    def _get_sections_in_radius(self, x, y, radius):
+        """Get the sections a field of view from a position can reach"""
+        chunk_size = self.map.CHUNK_SIZE
+        return {(section_x, section_y)
+                for section_y in range((y - radius) // chunk_size, (y + radius) // chunk_size + 1)
+                for section_x in range((x - radius) // chunk_size, (x + radius) // chunk_size + 1)}
+
+    def _compute_uncached_fov(self, x, y, radius, sections, masks):
+        """
+        Cast a field of view and cache it.
+
+        Args:
+            x, y: Observer position
+            radius (int): Maximum sight distance
+            sections: Sections the field of view can reach
+            masks: Opacity bitmasks by section, covering at least those sections
+
+        Returns:
+            frozenset: Set of visible (x, y) positions, including the observer
+        """
+        chunk_size = self.map.CHUNK_SIZE
+
+        def is_opaque(tile_x, tile_y):
+            row = masks[(tile_x // chunk_size, tile_y // chunk_size)][tile_y % chunk_size]
+            return (row >> (tile_x % chunk_size)) & 1 == 1
+
+        visible = {(x, y)}
+        for xx, xy, yx, yy in OCTANTS:
+            self._cast_light(x, y, radius, 1, 1.0, 0.0, xx, xy, yx, yy, is_opaque, visible)
+        visible = frozenset(visible)
+
+        # Cache the result and remember which chunks it depends on
+        fov_key = (x, y, radius)
+        self.fov_cache[fov_key] = (visible, sections)
+        for section_key in sections:
+            self.fov_keys_by_section.setdefault(section_key, set()).add(fov_key)
+
+        # Drop the least recently used results once the cache is full
+        while len(self.fov_cache) > self.cache_size:
+            self._forget_fov(next(iter(self.fov_cache)))
+
+        return visible
+
+    def compute_fov_batch(self, observers, radius):
+        """
+        Get the visible tiles for many observers in one call.
+
+        The sections needed by every observer without a cached result are
+        collected first and their masks looked up once, then each observer is
+        cast against that shared mapping.
+
+        Args:
+            observers: Iterable of (x, y) positions
+            radius (int): Maximum sight distance
+
+        Returns:
+            dict: Map of (x, y) to the frozenset of visible positions
+        """
+        results = {}
+        uncached = {}
+        for x, y in observers:
+            fov_key = (x, y, radius)
+            cached = self.fov_cache.get(fov_key)
+            if cached is not None:
+                self.fov_cache.move_to_end(fov_key)
+                results[(x, y)] = cached[0]
+            else:
+                uncached[(x, y)] = self._get_sections_in_radius(x, y, radius)
+
+        # Fetch the union of the needed masks once for all observers
+        needed = set().union(*uncached.values())
+        masks = {section_key: self._get_masks(section_key) for section_key in needed}
+
+        for (x, y), sections in uncached.items():
+            results[(x, y)] = self._compute_uncached_fov(x, y, radius, sections, masks)
+        return results
+
+    def has_line_of_sight(self, observer, target, radius):
+        """
+        Check if a target can be seen from an observer within a radius.
+
+        Args:
+            observer: Observer position (x, y)
+            target: Target position (x, y)
+            radius (int): Maximum sight distance
+
+        Returns:
+            bool: True if the target is visible
+        """
+        return tuple(target) in self.compute_fov(observer[0], observer[1], radius)
+
+    def _cast_light(self, cx, cy, radius, row, start_slope, end_slope, xx, xy, yx, yy, is_opaque, visible):
+        """
+        Scan one octant row by row, recursing around opaque tiles.
+
+        Args:
+            cx, cy: Observer position
+            radius: Maximum sight distance
+            row: Distance of the first row to scan
+            start_slope, end_slope: Slopes bounding the lit area of this scan
+            xx, xy, yx, yy: Octant transform
+            is_opaque: Function taking (x, y) and returning True if it blocks sight
+            visible: Set that visible positions are added to
+        """
+        if start_slope < end_slope:
+            return
+
+        radius_squared = radius * radius
+        for distance in range(row, radius + 1):
+            dx = -distance - 1
+            dy = -distance
+            blocked = False
+            new_start = start_slope
+
+            while dx <= 0:
+                dx += 1
+
+                # Slopes of the left and right edges of this tile
+                left_slope = (dx - 0.5) / (dy + 0.5)
+                right_slope = (dx + 0.5) / (dy - 0.5)
+                if start_slope < right_slope:
+                    continue
+                if end_slope > left_slope:
+                    break
+
+                tile_x = cx + dx * xx + dy * xy
+                tile_y = cy + dx * yx + dy * yy
+                if dx * dx + dy * dy <= radius_squared:
+                    visible.add((tile_x, tile_y))
+
+                if blocked:
+                    # Scanning a run of opaque tiles
+                    if is_opaque(tile_x, tile_y):
+                        new_start = right_slope
+                        continue
+                    blocked = False
+                    start_slope = new_start
+                elif is_opaque(tile_x, tile_y) and distance < radius:
+                    # Start of an opaque run: scan the lit part beyond it
+                    blocked = True
+                    self._cast_light(cx, cy, radius, distance + 1, start_slope, left_slope,
+                                     xx, xy, yx, yy, is_opaque, visible)
+                    new_start = right_slope
+
+            if blocked:
+                break
+
+
+if __name__ == "__main__":
+    infinite_map = InfiniteRogueMap(seed=42, chunk_local_hallways=True)
+    map_lines = infinite_map.generate_map_section(0, 0, width=80, height=40).split('\n')
+
+    # Stand on the first floor tile found and show what can be seen from there
+    start_x, start_y = next((x - 40, y - 20) for y, line in enumerate(map_lines)
+                            for x, tile in enumerate(line) if tile == '.')
+    visible = FieldOfView(infinite_map).compute_fov(start_x, start_y, radius=12)
+
+    for y, line in enumerate(map_lines):
+        print(''.join('@' if (x - 40, y - 20) == (start_x, start_y)
+                      else tile if (x - 40, y - 20) in visible else ' '
+                      for x, tile in enumerate(line)))
@@ -0,0 +1,75 @@
+from PIL import Image
+import os
+import sys
+
+# PNG palettes hold at most 256 colours
+MAX_PALETTE_COLORS = 256
+
+def to_indexed(image):
+    """
+    Convert an image to a palette image that holds exactly the same RGBA colours.
+
+    Returns None if the image has more colours than a palette can hold.
+    """
+    rgba = image.convert('RGBA')
+    colors = rgba.getcolors(MAX_PALETTE_COLORS)
+    if colors is None:
+        return None
+
+    # Put transparent colours first so the tRNS chunk can stop at the last one
+    palette_colors = sorted((color for _, color in colors), key=lambda color: (color[3] == 255, color))
+    index_by_color = {color: index for index, color in enumerate(palette_colors)}
+
+    data = rgba.tobytes()
+    indices = bytes(index_by_color[tuple(data[i:i + 4])] for i in range(0, len(data), 4))
+    indexed = Image.frombytes('P', rgba.size, indices)
+    indexed.putpalette([channel for color in palette_colors for channel in color[:3]])
+
+    alphas = [color[3] for color in palette_colors]
+    while alphas and alphas[-1] == 255:
+        alphas.pop()
+    if alphas:
+        indexed.info['transparency'] = bytes(alphas)
+
+    return indexed
+
+def save_indexed_png(image, path):
+    """
+    Save an image as the smallest palette PNG that decodes to the same pixels.
+
+    Pillow picks a 1, 2, 4 or 8-bit depth from the palette size, so a single
+    colour glyph with binary transparency is written as 1-bit plus tRNS alpha.
+    Falls back to a compressed RGBA PNG if there are too many colours.
+
+    Raises:
+        ValueError: If the saved file doesn't decode to the original pixels
+    """
+    rgba = image.convert('RGBA')
+    indexed = to_indexed(rgba)
+
+    if indexed is None:
+        rgba.save(path, 'PNG', optimize=True)
+    else:
+        indexed.save(path, 'PNG', optimize=True, transparency=indexed.info.get('transparency'))
+
+    # Make sure nothing was lost along the way
+    with Image.open(path) as saved:
+        if saved.convert('RGBA').tobytes() != rgba.tobytes():
+            raise ValueError(f"{path} does not match the source image pixel for pixel")
+
+def optimize_png_file(path):
+    """Re-save a PNG in place as an indexed PNG and print the size change"""
+    size_before = os.path.getsize(path)
+    with Image.open(path) as image:
+        image.load()
+    save_indexed_png(image, path)
+    size_after = os.path.getsize(path)
+    print(f"{path}: {size_before} -> {size_after} bytes")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python indexed_png.py <image.png> [<image.png> ...]")
+        sys.exit(1)
+
+    for png_path in sys.argv[1:]:
+        optimize_png_file(png_path)
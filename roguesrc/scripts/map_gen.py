@@ -1,24 +1,81 @@
 import random
 import hashlib
+import heapq
+import math
+import struct
+import threading
+import weakref
+from array import array
 from collections import deque
 
+# Tiles that can be walked on (kept in sync with MapUtil.IsWalkableTile)
+WALKABLE_TILES = frozenset('.X╬')
+
+# Distance stored for tiles that no source can reach
+UNREACHABLE = 0xFFFF
+
+# Direction codes for the direction grid, each pointing one step closer to a source
+DIRECTION_STEPS = [('N', 0, -1), ('S', 0, 1), ('W', -1, 0), ('E', 1, 0)]
+SOURCE_DIRECTION = '*'
+NO_DIRECTION = ' '
+
+# Overview characters for rooms, by the walls that have doors
+OVERVIEW_ROOM_SYMBOLS = {
+    frozenset(): '■',
+    frozenset('N'): '╨', frozenset('S'): '╥', frozenset('E'): '╞', frozenset('W'): '╡',
+    frozenset('NS'): '║', frozenset('EW'): '═',
+    frozenset('NE'): '╚', frozenset('NW'): '╝', frozenset('SE'): '╔', frozenset('SW'): '╗',
+    frozenset('NSE'): '╠', frozenset('NSW'): '╣', frozenset('NEW'): '╩', frozenset('SEW'): '╦',
+    frozenset('NSEW'): '╬'
+}
+
+# Chance of a section having a room (matches the 0.2 threshold in _build_room)
+ROOM_PROBABILITY = 0.8
+
+# Overview characters for blocks of sections, from far fewer rooms than expected
+# to far more, split at these numbers of standard deviations from the expected count
+OVERVIEW_DENSITY_SYMBOLS = ' ░▒▓█'
+OVERVIEW_DENSITY_THRESHOLDS = [-1.5, -0.5, 0.5, 1.5]
+
+# Marker for sections that haven't been generated yet (None means "no room")
+_NOT_GENERATED = object()
+
 class InfiniteRogueMap:
     """
     A procedurally generated infinite map in the style of classic Rogue.
     Uses a seed to deterministically generate map sections on demand.
     """
     
-    def __init__(self, seed=None):
+    def __init__(self, seed=None, chunk_local_hallways=False):
         """
         Initialize the infinite map with a seed.
         
         Args:
             seed: Random seed for map generation
+            chunk_local_hallways: If True, the hallway and doors between two adjacent
+                sections depend only on the seed and the section pair, so tiles are
+                the same no matter which areas were generated first
+        
+        The map can be shared between threads: each room is generated exactly once.
+        Only chunk-local maps give stable output under concurrent use, though. In the
+        default mode, hallways are routed between every cached room, so the tiles one
+        thread sees depend on what other threads have generated, and when.
         """
         self.seed = seed if seed is not None else random.randint(0, 1000000)
+        self.chunk_local_hallways = chunk_local_hallways
         self.room_cache = {}  # Cache of generated rooms by coordinates
         self.hallway_cache = {}  # Cache of generated hallways
-        self.processing_sections = set()  # Track sections being processed to avoid recursion
+        self.section_pair_cache = {}  # Cache of chunk-local hallways by section pair
+        self.chunk_listeners = weakref.WeakSet()  # Objects told about changed chunks they track
+        self._thread_state = threading.local()  # Per-thread recursion guard
+        
+        # Locks for thread safety. Rooms are generated under one of several striped
+        # locks picked by section, so each section is generated exactly once while
+        # unrelated sections can be generated in parallel. Hallways span sections
+        # and are generated under a single lock.
+        self.SECTION_LOCK_STRIPES = 64
+        self._section_locks = [threading.Lock() for _ in range(self.SECTION_LOCK_STRIPES)]
+        self._hallway_lock = threading.RLock()
         
         # Map tile characters
         self.FLOOR = '.'
@@ -41,6 +98,35 @@ class InfiniteRogueMap:
         # Section size (each section can contain one room)
         self.CHUNK_SIZE = 20
     
+    @property
+    def processing_sections(self):
+        """Sections being processed by the current thread, to avoid recursion"""
+        if not hasattr(self._thread_state, 'processing_sections'):
+            self._thread_state.processing_sections = set()
+        return self._thread_state.processing_sections
+    
+    def add_chunk_listener(self, listener):
+        """
+        Register an object to be told when generate_map_section changes chunks.
+        Listeners are held weakly, so they are dropped once nothing else uses them.
+        
+        Args:
+            listener: Object with an update_chunk(section_key, tiles) method and a
+                tracked_chunks() method returning the section keys it wants to hear
+                about. Only those chunks are rasterised for it.
+        """
+        with self._hallway_lock:
+            self.chunk_listeners.add(listener)
+    
+    def remove_chunk_listener(self, listener):
+        """Stop telling an object about changed chunks"""
+        with self._hallway_lock:
+            self.chunk_listeners.discard(listener)
+    
+    def _get_section_lock(self, section_key):
+        """Get the striped lock guarding generation of a section"""
+        return self._section_locks[hash(section_key) % self.SECTION_LOCK_STRIPES]
+    
     def get_tile(self, x, y):
         """
         Get the map tile at the specified coordinates.
@@ -56,6 +142,9 @@ class InfiniteRogueMap:
         section_x = x // self.CHUNK_SIZE
         section_y = y // self.CHUNK_SIZE
         
+        if self.chunk_local_hallways:
+            return self._get_chunk_local_tile(x, y, section_x, section_y)
+        
         # Get or generate the room for this section
         room = self._get_or_generate_room(section_x, section_y)
         
@@ -84,17 +173,61 @@ class InfiniteRogueMap:
         """
         section_key = (section_x, section_y)
         
-        # Return cached room if available
-        if section_key in self.room_cache:
-            return self.room_cache[section_key]
+        # Return cached room if available (finished sections are read without locking)
+        room = self.room_cache.get(section_key, _NOT_GENERATED)
+        if room is not _NOT_GENERATED:
+            return room
         
         # Check if we're already processing this section (avoid recursion)
         if section_key in self.processing_sections:
             return None
         
+        with self._get_section_lock(section_key):
+            # Another thread may have generated it while we were waiting
+            room = self.room_cache.get(section_key, _NOT_GENERATED)
+            if room is not _NOT_GENERATED:
+                return room
+            
+            return self._generate_room(section_x, section_y)
+    
+    def _generate_room(self, section_x, section_y):
+        """
+        Generate the room for a section and add it to the cache.
+        Must be called with the section's lock held.
+        
+        Args:
+            section_x (int): Section X coordinate
+            section_y (int): Section Y coordinate
+            
+        Returns:
+            dict: Room data or None if no room in this section
+        """
+        section_key = (section_x, section_y)
+        
         # Mark this section as being processed
         self.processing_sections.add(section_key)
         
+        room = self._build_room(section_x, section_y)
+        
+        # Cache the room (None if there's no room in this section)
+        self.room_cache[section_key] = room
+        
+        # Remove from processing set
+        self.processing_sections.remove(section_key)
+        
+        return room
+    
+    def _build_room(self, section_x, section_y):
+        """
+        Build the room data for a section without caching it.
+        
+        Args:
+            section_x (int): Section X coordinate
+            section_y (int): Section Y coordinate
+            
+        Returns:
+            dict: Room data or None if no room in this section
+        """
         # Generate a new room with deterministic randomness
         room_rng = self._get_section_rng(section_x, section_y)
         
@@ -120,25 +253,21 @@ class InfiniteRogueMap:
                 'width': room_width,
                 'height': room_height,
                 'doors': doors,
-                'section': (section_x, section_y)
+                'section': (section_x, section_y),
+                # Floor tiles inside the walls, for picking random spots with rng.choice
+                'floor_x': range(room_x + 1, room_x + room_width - 1),
+                'floor_y': range(room_y + 1, room_y + room_height - 1)
             }
             
-            # Cache the room
-            self.room_cache[section_key] = room
-            
-            # Remove from processing set
-            self.processing_sections.remove(section_key)
-            
             return room
         
         # No room in this section
-        self.room_cache[section_key] = None
-        
-        # Remove from processing set
-        self.processing_sections.remove(section_key)
-        
         return None
     
+    def _section_has_room(self, section_x, section_y):
+        """Check if a section has a room, using only the first draw of its RNG"""
+        return self._get_section_rng(section_x, section_y).random() > 0.2
+    
     def _schedule_hallway_generation(self, room, section_x, section_y):
         """
         Schedule hallway generation for a room to avoid recursion.
@@ -325,7 +454,7 @@ class InfiniteRogueMap:
             door1, door2 = best_door_pair
             
             # Get all rooms for pathfinding
-            rooms = [room for room in self.room_cache.values() if room is not None]
+            rooms = [room for room in list(self.room_cache.values()) if room is not None]
             
             # Create a pathfinding grid
             hallway_path = self._find_path_avoiding_rooms(door1, door2, rooms)
@@ -607,10 +736,10 @@ class InfiniteRogueMap:
         return (room['x'] <= x < room['x'] + room['width'] and 
                 room['y'] <= y < room['y'] + room['height'])
     
-    def _get_room_tile(self, x, y, room):
-        """Get the tile type for a position within a room"""
+    def _get_room_tile(self, x, y, room, doors=None):
+        """Get the tile type for a position within a room, optionally overriding its doors"""
         # Check if it's a door
-        if (x, y) in room['doors']:
+        if (x, y) in (room['doors'] if doors is None else doors):
             return self.DOOR
         
         # Check if it's a corner
@@ -634,30 +763,213 @@ class InfiniteRogueMap:
     
     def _get_hallway_tile(self, x, y):
         """Check if coordinates are in a hallway"""
-        for hallway_path in self.hallway_cache.values():
+        # Iterate over a snapshot since other threads may be adding hallways
+        for hallway_path in tuple(self.hallway_cache.values()):
             if (x, y) in hallway_path:
                 return self.HALLWAY
         return None
     
+    def _get_chunk_local_tile(self, x, y, section_x, section_y):
+        """
+        Get a tile in chunk-local mode, where hallways only come from section pairs.
+        
+        Args:
+            x, y: Tile coordinates
+            section_x, section_y: Section containing the tile
+            
+        Returns:
+            str: Character representing the map tile
+        """
+        room = self._get_or_generate_room(section_x, section_y)
+        if room and self._is_in_room(x, y, room):
+            # Doors without a hallway are drawn as plain wall
+            return self._get_room_tile(x, y, room, self._get_connected_doors(section_x, section_y))
+        
+        # A hallway through this section belongs to one of its four section pairs
+        for pair in self._get_section_pairs(section_x, section_y):
+            hallway = self._get_section_pair_hallway(*pair)
+            if hallway and (x, y) in hallway['path']:
+                return self.HALLWAY
+        
+        return self.EMPTY
+    
+    def _get_section_pairs(self, section_x, section_y):
+        """Get the pairs linking a section to its neighbours, each ordered left/top first"""
+        return [
+            ((section_x, section_y), (section_x + 1, section_y)),  # Right
+            ((section_x - 1, section_y), (section_x, section_y)),  # Left
+            ((section_x, section_y), (section_x, section_y + 1)),  # Down
+            ((section_x, section_y - 1), (section_x, section_y))   # Up
+        ]
+    
+    def _get_connected_doors(self, section_x, section_y):
+        """Get the doors of a section's room that have a chunk-local hallway"""
+        doors = set()
+        for pair in self._get_section_pairs(section_x, section_y):
+            hallway = self._get_section_pair_hallway(*pair)
+            if hallway:
+                doors.update(hallway['doors'])
+        return doors
+    
+    def _get_section_pair_hallway(self, section_a, section_b):
+        """
+        Get or generate the hallway between the rooms of two adjacent sections.
+        The result depends only on the seed and the two sections, and the path
+        never leaves them, so it can be generated in any order and cached forever.
+        
+        Args:
+            section_a: Left or top section (x, y)
+            section_b: Right or bottom section (x, y)
+            
+        Returns:
+            dict: Hallway with 'path' (frozenset of positions) and 'doors', or None
+        """
+        pair_key = (section_a, section_b)
+        
+        # Finished pairs are read without locking
+        hallway = self.section_pair_cache.get(pair_key, _NOT_GENERATED)
+        if hallway is not _NOT_GENERATED:
+            return hallway
+        
+        # Generate both rooms first so their section locks are never taken while
+        # holding the pair's lock
+        self._get_or_generate_room(*section_a)
+        self._get_or_generate_room(*section_b)
+        
+        with self._get_section_lock(pair_key):
+            hallway = self.section_pair_cache.get(pair_key, _NOT_GENERATED)
+            if hallway is not _NOT_GENERATED:
+                return hallway
+            
+            hallway = self._generate_section_pair_hallway(section_a, section_b)
+            self.section_pair_cache[pair_key] = hallway
+            return hallway
+    
+    def _generate_section_pair_hallway(self, section_a, section_b):
+        """
+        Route a hallway between the closest doors of two adjacent rooms.
+        
+        Args:
+            section_a, section_b: The two sections
+            
+        Returns:
+            dict: Hallway with 'path' and 'doors', or None if either room is missing
+        """
+        room_a = self._get_or_generate_room(*section_a)
+        room_b = self._get_or_generate_room(*section_b)
+        if not room_a or not room_b or not room_a['doors'] or not room_b['doors']:
+            return None
+        
+        # Pick the closest door pair, breaking ties deterministically for this pair
+        door_pairs = sorted((self._heuristic(door_a, door_b), door_a, door_b)
+                            for door_a in room_a['doors'] for door_b in room_b['doors'])
+        best_distance = door_pairs[0][0]
+        candidates = [(door_a, door_b) for distance, door_a, door_b in door_pairs if distance == best_distance]
+        door_a, door_b = self._get_section_pair_rng(section_a, section_b).choice(candidates)
+        
+        # Rooms always leave a free border inside their section, so a path that
+        # stays within the two sections can route around both rooms
+        min_x = min(section_a[0], section_b[0]) * self.CHUNK_SIZE
+        min_y = min(section_a[1], section_b[1]) * self.CHUNK_SIZE
+        max_x = (max(section_a[0], section_b[0]) + 1) * self.CHUNK_SIZE
+        max_y = (max(section_a[1], section_b[1]) + 1) * self.CHUNK_SIZE
+        
+        blocked_positions = set()
+        for room in (room_a, room_b):
+            for x in range(room['x'], room['x'] + room['width']):
+                for y in range(room['y'], room['y'] + room['height']):
+                    blocked_positions.add((x, y))
+        blocked_positions.discard(door_a)
+        blocked_positions.discard(door_b)
+        
+        path = self._find_path_in_bounds(door_a, door_b, blocked_positions, (min_x, min_y, max_x, max_y))
+        if not path:
+            return None
+        
+        return {
+            'path': frozenset(path),
+            'doors': (door_a, door_b)
+        }
+    
+    def _find_path_in_bounds(self, start, end, blocked_positions, bounds):
+        """
+        Find a shortest path with A*, staying inside a rectangle.
+        
+        Args:
+            start: Starting point (x, y)
+            end: Ending point (x, y)
+            blocked_positions: Set of positions to avoid
+            bounds: (min_x, min_y, max_x, max_y), max exclusive
+            
+        Returns:
+            list: List of coordinates in the path, or an empty list
+        """
+        min_x, min_y, max_x, max_y = bounds
+        open_set = [(self._heuristic(start, end), 0, start)]
+        came_from = {start: None}
+        best_g = {start: 0}
+        
+        while open_set:
+            _, g, current = heapq.heappop(open_set)
+            
+            if current == end:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = came_from[current]
+                return path[::-1]
+            
+            if g > best_g[current]:
+                continue
+            
+            x, y = current
+            for neighbor in [(x+1, y), (x-1, y), (x, y+1), (x, y-1)]:
+                if not (min_x <= neighbor[0] < max_x and min_y <= neighbor[1] < max_y):
+                    continue
+                if neighbor in blocked_positions:
+                    continue
+                
+                new_g = g + 1
+                if new_g < best_g.get(neighbor, float('inf')):
+                    best_g[neighbor] = new_g
+                    came_from[neighbor] = current
+                    heapq.heappush(open_set, (new_g + self._heuristic(neighbor, end), new_g, neighbor))
+        
+        return []
+    
     def _get_section_rng(self, section_x, section_y):
         """Get a deterministic RNG for a section based on the seed"""
         section_seed = f"{self.seed}_{section_x}_{section_y}"
         hash_val = int(hashlib.md5(section_seed.encode()).hexdigest(), 16)
         return random.Random(hash_val)
     
+    def _get_section_pair_rng(self, section_a, section_b):
+        """Get a deterministic RNG for a pair of sections based on the seed"""
+        pair_seed = f"{self.seed}_{section_a[0]}_{section_a[1]}_{section_b[0]}_{section_b[1]}"
+        hash_val = int(hashlib.md5(pair_seed.encode()).hexdigest(), 16)
+        return random.Random(hash_val)
+    
     def _get_path_rng(self, start, end):
         """Get a deterministic RNG for a path based on endpoints"""
         path_seed = f"{self.seed}_{start[0]}_{start[1]}_{end[0]}_{end[1]}"
         hash_val = int(hashlib.md5(path_seed.encode()).hexdigest(), 16)
         return random.Random(hash_val)
     
-    def generate_map_section(self, center_x, center_y, width=40, height=20):
+    def generate_map_section(self, center_x, center_y, width=40, height=20, distance_field=None):
         """
         Generate a section of the map as a string.
         
+        In the default mode, hallways are routed between every cached room under one
+        lock, but the area is rendered after that lock is released. Another thread
+        may add hallways and prune doors in between, so concurrent callers can see
+        timing-dependent tiles. Use chunk_local_hallways=True for stable output
+        under concurrent use.
+        
         Args:
             center_x, center_y: Center coordinates
             width, height: Dimensions of the map section
+            distance_field: Optional DistanceField to update with the chunks
+                that were generated or changed by this call
             
         Returns:
             str: String representation of the map section
@@ -672,15 +984,62 @@ class InfiniteRogueMap:
                 section_y = y // self.CHUNK_SIZE
                 self._get_or_generate_room(section_x, section_y)
         
-        # Then generate hallways between all rooms
-        for section_key, room in self.room_cache.items():
-            if room:  # Skip empty sections
-                section_x, section_y = section_key
-                self._generate_hallways_for_room(room, section_x, section_y)
+        # Chunk-local hallways are generated lazily by get_tile and never change
+        # tiles outside their section pair, so only the visible chunks can be new
+        # and chunk listeners never need to hear about changes
+        if self.chunk_local_hallways:
+            if distance_field is not None:
+                for section_x, section_y in self._get_sections_in_area(start_x, start_y, width, height):
+                    if (section_x, section_y) not in distance_field.chunk_tiles:
+                        distance_field.update_chunk((section_x, section_y),
+                                                    self.get_chunk_tiles(section_x, section_y))
+            return self._render_area(start_x, start_y, width, height)
         
-        # Clean up any doors that don't connect to hallways
-        self._remove_unconnected_doors()
+        # Hallways depend on every cached room, so only one thread routes them at a time
+        with self._hallway_lock:
+            # Listeners that haven't looked at any chunk yet have nothing to update
+            listeners = [(listener, listener.tracked_chunks()) for listener in self.chunk_listeners]
+            listeners = [(listener, tracked) for listener, tracked in listeners if tracked]
+            
+            # Remember what existed before so changed chunks can be found afterwards.
+            # The distance field wants every changed chunk, listeners only the ones they track.
+            if listeners or distance_field is not None:
+                known_hallways = set(self.hallway_cache)
+                if distance_field is not None:
+                    known_doors = {key: list(room['doors']) for key, room in list(self.room_cache.items()) if room}
+                else:
+                    tracked_sections = set().union(*(tracked for _, tracked in listeners))
+                    known_doors = {key: list(self.room_cache[key]['doors']) for key in tracked_sections
+                                   if self.room_cache.get(key)}
+            
+            # Then generate hallways between all rooms
+            for section_key, room in list(self.room_cache.items()):
+                if room:  # Skip empty sections
+                    section_x, section_y = section_key
+                    self._generate_hallways_for_room(room, section_x, section_y)
+            
+            # Clean up any doors that don't connect to hallways
+            self._remove_unconnected_doors()
+            
+            if listeners or distance_field is not None:
+                changed_sections = self._get_changed_sections(start_x, start_y, width, height,
+                                                              known_hallways, known_doors)
+                for section_key in changed_sections:
+                    # Only rasterise chunks that someone wants
+                    interested = [listener for listener, tracked in listeners if section_key in tracked]
+                    if distance_field is not None:
+                        interested.append(distance_field)
+                    if not interested:
+                        continue
+                    
+                    tiles = self.get_chunk_tiles(*section_key)
+                    for listener in interested:
+                        listener.update_chunk(section_key, tiles)
         
+        return self._render_area(start_x, start_y, width, height)
+    
+    def _render_area(self, start_x, start_y, width, height):
+        """Render an area of the map as a string"""
         # Generate the map grid
         map_grid = [[self.get_tile(start_x + x, start_y + y) for x in range(width)] 
                     for y in range(height)]
@@ -688,6 +1047,225 @@ class InfiniteRogueMap:
         # Convert to string
         return '\n'.join([''.join(row) for row in map_grid])
     
+    def _get_sections_in_area(self, start_x, start_y, width, height):
+        """Get the (section_x, section_y) keys of all sections overlapping an area"""
+        return {(section_x, section_y)
+                for section_y in range(start_y // self.CHUNK_SIZE, (start_y + height - 1) // self.CHUNK_SIZE + 1)
+                for section_x in range(start_x // self.CHUNK_SIZE, (start_x + width - 1) // self.CHUNK_SIZE + 1)}
+    
+    def rooms_in_rect(self, x0, y0, x1, y1):
+        """
+        Find the rooms whose floor overlaps a rectangle, generating only the
+        sections it covers.
+        
+        Args:
+            x0, y0: One corner of the rectangle (inclusive)
+            x1, y1: Opposite corner of the rectangle (inclusive)
+            
+        Returns:
+            list: (room, floor_x, floor_y) tuples, where floor_x and floor_y are
+                ranges of the room's floor tiles clipped to the rectangle
+        """
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        
+        results = []
+        for section_y in range(y0 // self.CHUNK_SIZE, y1 // self.CHUNK_SIZE + 1):
+            for section_x in range(x0 // self.CHUNK_SIZE, x1 // self.CHUNK_SIZE + 1):
+                room = self._get_or_generate_room(section_x, section_y)
+                if not room:
+                    continue
+                
+                floor_x = range(max(x0, room['floor_x'].start), min(x1 + 1, room['floor_x'].stop))
+                floor_y = range(max(y0, room['floor_y'].start), min(y1 + 1, room['floor_y'].stop))
+                if floor_x and floor_y:
+                    results.append((room, floor_x, floor_y))
+        
+        return results
+    
+    def nearest_room(self, x, y, max_rings=50):
+        """
+        Find the room with the floor tile closest to a point, searching sections
+        in rings around the point's section.
+        
+        Args:
+            x, y: Point to search from
+            max_rings (int): Number of rings of sections to search before giving up
+            
+        Returns:
+            tuple: (room, (floor_x, floor_y) closest floor tile, distance), or None
+                if no room was found
+        """
+        center_x = x // self.CHUNK_SIZE
+        center_y = y // self.CHUNK_SIZE
+        
+        best = None
+        best_distance = float('inf')
+        for ring in range(max_rings + 1):
+            # Every section in this ring is at least (ring - 1) sections away,
+            # so nothing further out can beat what has been found
+            if (ring - 1) * self.CHUNK_SIZE >= best_distance:
+                break
+            
+            for section_x, section_y in self._get_ring_sections(center_x, center_y, ring):
+                room = self._get_or_generate_room(section_x, section_y)
+                if not room:
+                    continue
+                
+                # Closest floor tile is the point clamped to the floor ranges
+                floor_x = min(max(x, room['floor_x'].start), room['floor_x'].stop - 1)
+                floor_y = min(max(y, room['floor_y'].start), room['floor_y'].stop - 1)
+                distance = ((floor_x - x) ** 2 + (floor_y - y) ** 2) ** 0.5
+                if distance < best_distance:
+                    best_distance = distance
+                    best = (room, (floor_x, floor_y), distance)
+        
+        return best
+    
+    def _get_ring_sections(self, center_x, center_y, ring):
+        """Get the sections at exactly ring steps (Chebyshev distance) from a section"""
+        if ring == 0:
+            return [(center_x, center_y)]
+        
+        sections = []
+        for offset in range(-ring, ring + 1):
+            sections.append((center_x + offset, center_y - ring))  # Top edge
+            sections.append((center_x + offset, center_y + ring))  # Bottom edge
+        for offset in range(-ring + 1, ring):
+            sections.append((center_x - ring, center_y + offset))  # Left edge
+            sections.append((center_x + ring, center_y + offset))  # Right edge
+        return sections
+    
+    def generate_overview(self, center_x, center_y, width=4000, height=2000, sections_per_cell=1):
+        """
+        Generate a downsampled overview of the map from room metadata only.
+        No tiles are rasterised and no hallways are routed, so the cost grows
+        with the number of sections covered rather than the number of tiles.
+        
+        With one section per cell, each room is drawn as a box character whose
+        arms point towards the walls that have doors. The doors are the ones the
+        room was generated with, before any are dropped for lacking a hallway,
+        so the overview depends only on the seed.
+        
+        With larger cells, each cell shows how far its room count deviates from
+        the expected 80% of its sections, from ' ' (sparse) through '▒' (about
+        as expected) to '█' (dense). Every section has a room independently, so
+        raw density would be the same in every big block; the deviation is what
+        shows sparse and crowded regions.
+        
+        Args:
+            center_x, center_y: Center coordinates in tiles
+            width, height: Dimensions of the covered area in tiles
+            sections_per_cell (int): Sections along each side of one cell
+            
+        Returns:
+            str: String representation of the overview, one character per cell
+        """
+        cell_size = self.CHUNK_SIZE * sections_per_cell
+        start_cell_x = (center_x - width // 2) // cell_size
+        start_cell_y = (center_y - height // 2) // cell_size
+        end_cell_x = (center_x - width // 2 + width - 1) // cell_size
+        end_cell_y = (center_y - height // 2 + height - 1) // cell_size
+        
+        rows = []
+        for cell_y in range(start_cell_y, end_cell_y + 1):
+            row = []
+            for cell_x in range(start_cell_x, end_cell_x + 1):
+                if sections_per_cell == 1:
+                    row.append(self._get_overview_room_symbol(cell_x, cell_y))
+                else:
+                    row.append(self._get_overview_density_symbol(cell_x, cell_y, sections_per_cell))
+            rows.append(''.join(row))
+        
+        return '\n'.join(rows)
+    
+    def _get_overview_room_symbol(self, section_x, section_y):
+        """Get the overview character for a single section"""
+        # Always rebuild the room rather than using the cache: cached rooms may
+        # have had doors pruned, and building without caching keeps huge
+        # overviews from filling the room cache
+        if not self._section_has_room(section_x, section_y):
+            return self.EMPTY
+        room = self._build_room(section_x, section_y)
+        
+        return OVERVIEW_ROOM_SYMBOLS[self._get_door_sides(room)]
+    
+    def _get_overview_density_symbol(self, cell_x, cell_y, sections_per_cell):
+        """Get the overview character for a block of sections, by how unusual its room count is"""
+        base_x = cell_x * sections_per_cell
+        base_y = cell_y * sections_per_cell
+        room_count = sum(1 for section_y in range(base_y, base_y + sections_per_cell)
+                         for section_x in range(base_x, base_x + sections_per_cell)
+                         if self._section_has_room(section_x, section_y))
+        
+        # Room counts are binomial, so measure the deviation in standard deviations
+        section_count = sections_per_cell * sections_per_cell
+        expected = section_count * ROOM_PROBABILITY
+        deviation = (room_count - expected) / math.sqrt(expected * (1 - ROOM_PROBABILITY))
+        
+        index = sum(1 for threshold in OVERVIEW_DENSITY_THRESHOLDS if deviation >= threshold)
+        return OVERVIEW_DENSITY_SYMBOLS[index]
+    
+    def _get_door_sides(self, room):
+        """Get the walls of a room that have doors, as a frozenset of 'N', 'S', 'E', 'W'"""
+        sides = set()
+        for door_x, door_y in room['doors']:
+            if door_y == room['y']:
+                sides.add('N')
+            elif door_y == room['y'] + room['height'] - 1:
+                sides.add('S')
+            elif door_x == room['x']:
+                sides.add('W')
+            elif door_x == room['x'] + room['width'] - 1:
+                sides.add('E')
+        return frozenset(sides)
+    
+    def get_chunk_tiles(self, section_x, section_y):
+        """
+        Get every tile of a section as a mapping of coordinates to characters.
+        
+        Args:
+            section_x, section_y: Section coordinates
+            
+        Returns:
+            dict: Map of (x, y) to tile character
+        """
+        base_x = section_x * self.CHUNK_SIZE
+        base_y = section_y * self.CHUNK_SIZE
+        return {(x, y): self.get_tile(x, y)
+                for y in range(base_y, base_y + self.CHUNK_SIZE)
+                for x in range(base_x, base_x + self.CHUNK_SIZE)}
+    
+    def _get_changed_sections(self, start_x, start_y, width, height, known_hallways, known_doors):
+        """
+        Find the sections whose tiles may differ from a previous snapshot.
+        
+        Args:
+            start_x, start_y: Top-left corner of the generated area
+            width, height: Dimensions of the generated area
+            known_hallways: Hallway cache keys from before generation
+            known_doors: Door lists per section from before generation
+            
+        Returns:
+            set: Set of (section_x, section_y) keys
+        """
+        # Every section in the visible area
+        changed = self._get_sections_in_area(start_x, start_y, width, height)
+        
+        # Sections crossed by new hallways, which may run outside the visible area
+        for room_pair, hallway in self.hallway_cache.items():
+            if room_pair not in known_hallways:
+                for x, y in hallway:
+                    changed.add((x // self.CHUNK_SIZE, y // self.CHUNK_SIZE))
+        
+        # Sections whose rooms lost doors
+        for section_key, doors in known_doors.items():
+            room = self.room_cache.get(section_key)
+            if room and room['doors'] != doors:
+                changed.add(section_key)
+        
+        return changed
+    
     def _remove_unconnected_doors(self):
         """Remove doors that don't connect to any hallways"""
         # Collect all doors that are part of hallways
@@ -697,18 +1275,234 @@ class InfiniteRogueMap:
                 connected_doors.add(pos)
         
         # Remove unconnected doors from each room
-        for room in self.room_cache.values():
+        for room in list(self.room_cache.values()):
             if room:  # Skip empty sections
                 room['doors'] = [door for door in room['doors'] if door in connected_doors]
 
 
+class DistanceField:
+    """
+    A distance field (Dijkstra map) over the walkable tiles of an InfiniteRogueMap.
+    Chunks are added as they are generated, and distances are updated incrementally
+    so that finished areas don't have to be searched again.
+    """
+    
+    def __init__(self, source_tiles='╬'):
+        """
+        Initialize an empty distance field.
+        
+        Args:
+            source_tiles: Tile characters that act as sources (distance 0)
+        """
+        self.source_tiles = frozenset(source_tiles)
+        self.walkable = set()  # All walkable positions seen so far
+        self.sources = set()  # Walkable positions that are sources
+        self.distances = {}  # Distance to the nearest source by position
+        self.chunk_tiles = {}  # Walkable positions per section, used to diff updates
+    
+    def update_chunk(self, section_key, tiles):
+        """
+        Add or refresh the tiles of one section.
+        
+        Args:
+            section_key: (section_x, section_y) of the chunk
+            tiles: Map of (x, y) to tile character covering the chunk
+        """
+        walkable = {pos for pos, tile in tiles.items() if tile in WALKABLE_TILES}
+        sources = {pos for pos in walkable if tiles[pos] in self.source_tiles}
+        
+        old_walkable = self.chunk_tiles.get(section_key, set())
+        old_sources = old_walkable & self.sources
+        self.chunk_tiles[section_key] = walkable
+        
+        added = walkable - old_walkable
+        added_sources = sources - old_sources
+        self.walkable |= added
+        self.sources |= added_sources
+        
+        # Removing tiles or sources can only make distances longer, which a
+        # relaxation can't express, so recompute everything from the sources
+        removed = old_walkable - walkable
+        removed_sources = old_sources - sources
+        if removed or removed_sources:
+            self.walkable -= removed
+            self.sources -= removed_sources
+            self._rebuild()
+            return
+        
+        # New tiles can only make distances shorter: start from the new sources and
+        # from known tiles bordering the new area, then relax outwards
+        seeds = []
+        for pos in added_sources:
+            self.distances[pos] = 0
+            seeds.append((0, pos))
+        for x, y in added:
+            for _, dx, dy in DIRECTION_STEPS:
+                neighbor = (x + dx, y + dy)
+                if neighbor in self.distances:
+                    seeds.append((self.distances[neighbor], neighbor))
+        self._relax(seeds)
+    
+    def _rebuild(self):
+        """Recompute all distances from the current sources"""
+        self.distances = {pos: 0 for pos in self.sources}
+        self._relax([(0, pos) for pos in self.sources])
+    
+    def _relax(self, seeds):
+        """
+        Propagate distances outwards from the given seeds, only ever lowering them.
+        
+        Args:
+            seeds: List of (distance, (x, y)) to start from
+        """
+        heapq.heapify(seeds)
+        while seeds:
+            distance, (x, y) = heapq.heappop(seeds)
+            if distance > self.distances.get((x, y), UNREACHABLE):
+                continue
+            
+            for _, dx, dy in DIRECTION_STEPS:
+                neighbor = (x + dx, y + dy)
+                if neighbor in self.walkable and distance + 1 < self.distances.get(neighbor, UNREACHABLE):
+                    self.distances[neighbor] = distance + 1
+                    heapq.heappush(seeds, (distance + 1, neighbor))
+    
+    def get_distance(self, x, y):
+        """Get the distance to the nearest source, or UNREACHABLE"""
+        return self.distances.get((x, y), UNREACHABLE)
+    
+    def get_direction(self, x, y):
+        """Get the direction code of the step towards the nearest source"""
+        distance = self.get_distance(x, y)
+        if distance == 0:
+            return SOURCE_DIRECTION
+        if distance == UNREACHABLE:
+            return NO_DIRECTION
+        
+        for code, dx, dy in DIRECTION_STEPS:
+            if self.get_distance(x + dx, y + dy) == distance - 1:
+                return code
+        return NO_DIRECTION
+    
+    def get_chunk_grids(self, section_x, section_y, chunk_size):
+        """
+        Get the distance and direction grids for one section.
+        
+        Args:
+            section_x, section_y: Section coordinates
+            chunk_size: Section size in tiles
+            
+        Returns:
+            tuple: (array of distances in row order, direction grid as a string)
+        """
+        base_x = section_x * chunk_size
+        base_y = section_y * chunk_size
+        distances = array('H', (self.get_distance(base_x + x, base_y + y)
+                                for y in range(chunk_size) for x in range(chunk_size)))
+        directions = '\n'.join(''.join(self.get_direction(base_x + x, base_y + y) for x in range(chunk_size))
+                               for y in range(chunk_size))
+        return distances, directions
+
+
+def compute_distance_field(map_str, source_tiles='╬'):
+    """
+    Compute a distance field for a finished map with a multi-source BFS.
+    The map is flattened into one array so that neighbors are plain index offsets.
+    
+    Args:
+        map_str: Map as produced by generate_map_section
+        source_tiles: Tile characters that act as sources (distance 0)
+        
+    Returns:
+        dict: Field data with width, height, distances and directions
+    """
+    lines = map_str.split('\n')
+    height = len(lines)
+    width = max((len(line) for line in lines), default=0)
+    
+    walkable = bytearray(width * height)
+    distances = array('H', [UNREACHABLE]) * (width * height)
+    queue = deque()
+    
+    for y, line in enumerate(lines):
+        row = y * width
+        for x, tile in enumerate(line):
+            if tile in WALKABLE_TILES:
+                walkable[row + x] = 1
+                if tile in source_tiles:
+                    distances[row + x] = 0
+                    queue.append(row + x)
+    
+    # Breadth-first search from all sources at once
+    while queue:
+        index = queue.popleft()
+        next_distance = distances[index] + 1
+        x = index % width
+        neighbors = [index - width, index + width]
+        if x > 0:
+            neighbors.append(index - 1)
+        if x < width - 1:
+            neighbors.append(index + 1)
+        
+        for neighbor in neighbors:
+            if 0 <= neighbor < len(walkable) and walkable[neighbor] and distances[neighbor] == UNREACHABLE:
+                distances[neighbor] = next_distance
+                queue.append(neighbor)
+    
+    # Point every reachable tile at a neighbor one step closer to a source
+    directions = bytearray(NO_DIRECTION.encode()) * (width * height)
+    for index, distance in enumerate(distances):
+        if distance == 0:
+            directions[index] = ord(SOURCE_DIRECTION)
+            continue
+        if distance == UNREACHABLE:
+            continue
+        
+        x, y = index % width, index // width
+        for code, dx, dy in DIRECTION_STEPS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and distances[ny * width + nx] == distance - 1:
+                directions[index] = ord(code)
+                break
+    
+    return {
+        'width': width,
+        'height': height,
+        'distances': distances,
+        'directions': directions
+    }
+
+
 map_file_name = "../RogueLib/resources/map.txt"
+distance_file_name = "../RogueLib/resources/map.dist"
+direction_file_name = "../RogueLib/resources/map.dir"
 
 def save_map_to_file(map_str, filename=map_file_name):
     """Save the generated map to a file"""
     with open(filename, 'w') as f:
         f.write(map_str)
 
+def save_distance_field_to_files(field, distance_filename=distance_file_name, direction_filename=direction_file_name):
+    """
+    Save a distance field next to the map.
+    
+    The distance file is a little-endian uint16 width and height followed by one
+    uint16 per tile in row order (0xFFFF for unreachable). The direction file has
+    one character per tile laid out like map.txt.
+    """
+    distances = array('H', field['distances'])
+    if struct.pack('=H', 1) != struct.pack('<H', 1):
+        distances.byteswap()
+    
+    with open(distance_filename, 'wb') as f:
+        f.write(struct.pack('<HH', field['width'], field['height']))
+        f.write(distances.tobytes())
+    
+    width = field['width']
+    directions = field['directions'].decode()
+    with open(direction_filename, 'w') as f:
+        f.write('\n'.join(directions[i:i + width] for i in range(0, len(directions), width)))
+
 if __name__ == "__main__":
     random_seed = random.randint(0, 1000000)
     infinite_map = InfiniteRogueMap(seed=random_seed)
@@ -719,3 +1513,6 @@ if __name__ == "__main__":
     print(map_section)
     save_map_to_file(map_section)
     print(f"Map saved to {map_file_name}")
+    
+    save_distance_field_to_files(compute_distance_field(map_section))
+    print(f"Distance field saved to {distance_file_name} and {direction_file_name}")
@@ -0,0 +1,305 @@
+import argparse
+import asyncio
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from map_gen import InfiniteRogueMap
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8437
+
+# Largest region served in one request, in tiles
+MAX_REGION_TILES = 1000000
+
+# Number of rendered chunks kept before the least recently used are dropped
+DEFAULT_CACHE_SIZE = 100000
+
+# Number of seeds with a live generator before the least recently used is dropped
+DEFAULT_MAX_MAPS = 8
+
+# Rooms and section pairs a generator may cache before it is replaced by a fresh one.
+# Chunk-local maps are a pure function of the seed, so this never changes output.
+DEFAULT_MAX_GENERATOR_SECTIONS = 200000
+
+STATUS_TEXT = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed'
+}
+
+
+def make_etag(body):
+    """Make a strong ETag for a response body"""
+    return '"' + hashlib.md5(body).hexdigest() + '"'
+
+
+class MapServer:
+    """
+    A local HTTP service that serves map chunks and regions from one shared
+    InfiniteRogueMap per seed.
+
+    Maps use chunk-local hallways, so a chunk never changes once generated and
+    can be cached under a stable ETag. Generation runs in a thread pool to keep
+    the event loop responsive.
+
+    Memory is bounded by three limits: the number of rendered chunks, the number
+    of seeds with a live generator, and the rooms and section pairs each
+    generator may cache before it is replaced.
+
+    Endpoints:
+        GET /chunk?seed=S&x=SX&y=SY          One section, by section coordinates
+        GET /region?seed=S&x=X&y=Y&w=W&h=H   Any area, by top-left tile and size
+    """
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, max_workers=None, max_maps=DEFAULT_MAX_MAPS,
+                 max_generator_sections=DEFAULT_MAX_GENERATOR_SECTIONS):
+        """
+        Initialize the server.
+
+        Args:
+            cache_size (int): Number of rendered chunks to keep
+            max_workers (int): Threads used for generation (None for the default)
+            max_maps (int): Number of seeds to keep a generator for
+            max_generator_sections (int): Cached rooms and section pairs per generator
+                before it is replaced
+        """
+        self.maps = OrderedDict()  # Shared generator per seed, LRU order
+        self.chunk_cache = OrderedDict()  # (seed, section_x, section_y) -> rendered chunk, LRU order
+        self.pending_chunks = {}  # Chunks being generated, so concurrent requests share the work
+        self.cache_size = cache_size
+        self.max_maps = max_maps
+        self.max_generator_sections = max_generator_sections
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _get_map(self, seed):
+        """Get the shared generator for a seed"""
+        infinite_map = self.maps.get(seed)
+        if infinite_map is None:
+            infinite_map = InfiniteRogueMap(seed=seed, chunk_local_hallways=True)
+            self.maps[seed] = infinite_map
+            if len(self.maps) > self.max_maps:
+                self.maps.popitem(last=False)
+        else:
+            self.maps.move_to_end(seed)
+        return infinite_map
+
+    def _render_chunk(self, infinite_map, section_x, section_y):
+        """
+        Render one section (runs in the executor).
+
+        Returns:
+            dict: 'rows' (CHUNK_SIZE strings), the encoded 'body' and its 'etag'
+        """
+        chunk_size = infinite_map.CHUNK_SIZE
+        base_x = section_x * chunk_size
+        base_y = section_y * chunk_size
+        rows = [''.join(infinite_map.get_tile(x, y) for x in range(base_x, base_x + chunk_size))
+                for y in range(base_y, base_y + chunk_size)]
+        body = '\n'.join(rows).encode('utf-8')
+        return {
+            'rows': rows,
+            'body': body,
+            'etag': make_etag(body)
+        }
+
+    def _finish_chunk(self, cache_key, pending):
+        """Cache a finished chunk, whether or not anyone is still waiting for it"""
+        del self.pending_chunks[cache_key]
+        if pending.cancelled() or pending.exception() is not None:
+            return
+
+        self.chunk_cache[cache_key] = pending.result()
+        if len(self.chunk_cache) > self.cache_size:
+            self.chunk_cache.popitem(last=False)
+
+        # Replace generators whose room and hallway caches have grown too big.
+        # Renders still running keep their reference to the old one.
+        seed = cache_key[0]
+        infinite_map = self.maps.get(seed)
+        if infinite_map is not None and (len(infinite_map.room_cache) + len(infinite_map.section_pair_cache)
+                                         > self.max_generator_sections):
+            del self.maps[seed]
+
+    async def get_chunk(self, seed, section_x, section_y):
+        """
+        Get a rendered chunk, from the cache or by generating it.
+
+        Args:
+            seed (int): Map seed
+            section_x, section_y (int): Section coordinates
+
+        Returns:
+            dict: 'rows' (CHUNK_SIZE strings of CHUNK_SIZE tiles), 'body' and 'etag'
+        """
+        cache_key = (seed, section_x, section_y)
+        chunk = self.chunk_cache.get(cache_key)
+        if chunk is not None:
+            self.chunk_cache.move_to_end(cache_key)
+            return chunk
+
+        # Start the generation unless one is already running for this chunk
+        pending = self.pending_chunks.get(cache_key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(self.executor, self._render_chunk,
+                                           self._get_map(seed), section_x, section_y)
+            self.pending_chunks[cache_key] = pending
+            pending.add_done_callback(lambda future: self._finish_chunk(cache_key, future))
+
+        # Shield the shared future so a cancelled request doesn't cancel it for
+        # everyone else waiting on the same chunk
+        return await asyncio.shield(pending)
+
+    async def get_region(self, seed, start_x, start_y, width, height):
+        """
+        Get an area of the map, assembled from cached chunks.
+
+        Args:
+            seed (int): Map seed
+            start_x, start_y (int): Top-left tile coordinates
+            width, height (int): Dimensions in tiles
+
+        Returns:
+            str: String representation of the area
+        """
+        chunk_size = self._get_map(seed).CHUNK_SIZE
+        sections_x = range(start_x // chunk_size, (start_x + width - 1) // chunk_size + 1)
+        sections_y = range(start_y // chunk_size, (start_y + height - 1) // chunk_size + 1)
+
+        chunks = await asyncio.gather(*(self.get_chunk(seed, section_x, section_y)
+                                        for section_y in sections_y for section_x in sections_x))
+        chunks = dict(zip(((section_x, section_y) for section_y in sections_y for section_x in sections_x),
+                          (chunk['rows'] for chunk in chunks)))
+
+        rows = []
+        for y in range(start_y, start_y + height):
+            row = []
+            for section_x in sections_x:
+                chunk_row = chunks[(section_x, y // chunk_size)][y % chunk_size]
+                left = max(start_x, section_x * chunk_size) - section_x * chunk_size
+                right = min(start_x + width, (section_x + 1) * chunk_size) - section_x * chunk_size
+                row.append(chunk_row[left:right])
+            rows.append(''.join(row))
+        return '\n'.join(rows)
+
+    async def handle_request(self, method, target, headers):
+        """
+        Handle one HTTP request.
+
+        Args:
+            method (str): Request method
+            target (str): Request target (path and query)
+            headers (dict): Request headers with lower-case names
+
+        Returns:
+            tuple: (status, extra headers dict, body bytes)
+        """
+        if method not in ('GET', 'HEAD'):
+            return 405, {'Allow': 'GET, HEAD'}, b'Only GET is supported\n'
+
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            seed = int(query['seed'])
+            if url.path == '/chunk':
+                # Chunks are cached already encoded with their ETag
+                chunk = await self.get_chunk(seed, int(query['x']), int(query['y']))
+                body = chunk['body']
+                etag = chunk['etag']
+            elif url.path == '/region':
+                width = int(query['w'])
+                height = int(query['h'])
+                if width <= 0 or height <= 0 or width * height > MAX_REGION_TILES:
+                    return 400, {}, f"Region must have between 1 and {MAX_REGION_TILES} tiles\n".encode()
+                body = await self.get_region(seed, int(query['x']), int(query['y']), width, height)
+                body = body.encode('utf-8')
+                etag = make_etag(body)
+            else:
+                return 404, {}, b'Unknown path, use /chunk or /region\n'
+        except (KeyError, ValueError) as e:
+            return 400, {}, f"Bad or missing parameter: {e}\n".encode()
+
+        response_headers = {
+            'ETag': etag,
+            'Cache-Control': 'public, max-age=31536000, immutable',
+            'Content-Type': 'text/plain; charset=utf-8'
+        }
+        if etag in [tag.strip() for tag in headers.get('if-none-match', '').split(',')]:
+            return 304, response_headers, b''
+        return 200, response_headers, body
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client closes it"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    await self._write_response(writer, 400, {}, b'Malformed request line\n', False)
+                    break
+                method, target, version = parts
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+                status, response_headers, body = await self.handle_request(method, target, headers)
+                if method == 'HEAD':
+                    response_headers['Content-Length'] = str(len(body))
+                    body = b''
+                await self._write_response(writer, status, response_headers, body, keep_alive)
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _write_response(self, writer, status, headers, body, keep_alive):
+        """Write an HTTP response"""
+        headers.setdefault('Content-Length', str(len(body)))
+        headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+        head = f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode('latin-1') + b'\r\n' + body)
+        await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Run the server until cancelled"""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Serving map chunks on http://{host}:{port}/")
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve map chunks and regions over HTTP")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help="Rendered chunks kept in memory")
+    parser.add_argument('--workers', type=int, default=None, help="Threads used for generation")
+    parser.add_argument('--max-maps', type=int, default=DEFAULT_MAX_MAPS, help="Seeds with a live generator")
+    parser.add_argument('--max-generator-sections', type=int, default=DEFAULT_MAX_GENERATOR_SECTIONS,
+                        help="Cached rooms and section pairs per generator before it is replaced")
+    args = parser.parse_args()
+
+    try:
+        server = MapServer(args.cache_size, args.workers, args.max_maps, args.max_generator_sections)
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import random
+import time
+
+from map_server import DEFAULT_HOST, DEFAULT_PORT
+
+# Matches InfiniteRogueMap.CHUNK_SIZE
+CHUNK_SIZE = 20
+
+
+async def read_response(reader):
+    """Read one HTTP response and return its status code"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Server closed the connection")
+    status = int(status_line.split()[1])
+
+    content_length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            content_length = int(value)
+
+    await reader.readexactly(content_length)
+    return status
+
+
+def make_target(rng, seed, area, region_ratio):
+    """Pick a random chunk or region request within an area of sections"""
+    section_x = rng.randint(-area, area)
+    section_y = rng.randint(-area, area)
+    if rng.random() < region_ratio:
+        x = section_x * CHUNK_SIZE + rng.randrange(CHUNK_SIZE)
+        y = section_y * CHUNK_SIZE + rng.randrange(CHUNK_SIZE)
+        return f"/region?seed={seed}&x={x}&y={y}&w=80&h=40"
+    return f"/chunk?seed={seed}&x={section_x}&y={section_y}"
+
+
+async def run_client(host, port, args, rng, deadline, latencies, errors):
+    """Send requests over one keep-alive connection until the deadline"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            target = make_target(rng, args.seed, args.area, args.region_ratio)
+            started = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, fraction):
+    """Get a percentile from sorted values"""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def main(args):
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + args.duration
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client(args.host, args.port, args, random.Random(i), deadline, latencies, errors)
+                           for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print("No requests completed")
+        return
+
+    latencies.sort()
+    print(f"Requests:     {len(latencies)} ({len(errors)} errors)")
+    print(f"Requests/sec: {len(latencies) / elapsed:.1f}")
+    for label, fraction in [('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('p99.9', 0.999)]:
+        print(f"{label + ':':<14}{percentile(latencies, fraction) * 1000:.2f} ms")
+    print(f"{'max:':<14}{latencies[-1] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure throughput and tail latency of map_server.py")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--concurrency', type=int, default=32, help="Number of simultaneous connections")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to run for")
+    parser.add_argument('--area', type=int, default=20, help="Requests fall within this many sections of the origin")
+    parser.add_argument('--region-ratio', type=float, default=0.25, help="Fraction of requests that are regions")
+    asyncio.run(main(parser.parse_args()))
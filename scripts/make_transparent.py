@@ -1,7 +1,12 @@
 from PIL import Image
+import sys
 
-# Load the image
-img = Image.open('../roguesrc/Rogue/images/Codepage-437.png')
+# The indexed PNG writer lives with the other image scripts
+sys.path.append('../roguesrc/scripts')
+from indexed_png import save_indexed_png
+
+# Load the original black-background sheet
+img = Image.open('../roguesrc/RogueLib/images/Codepage-437-original.png')
 
 # Convert to RGBA if it isn't already
 img = img.convert('RGBA')
@@ -23,5 +28,9 @@ for item in data:
 # Update the image with the new data
 img.putdata(new_data)
 
-# Save the modified image
-img.save('../roguesrc/Rogue/images/Codepage-437-transparent.png', 'PNG')
\ No newline at end of file
+# Save the modified image (pass --indexed for a palette PNG with the same pixels)
+output_path = '../roguesrc/RogueLib/images/Codepage-437-transparent.png'
+if '--indexed' in sys.argv[1:]:
+    save_indexed_png(img, output_path)
+else:
+    img.save(output_path, 'PNG')
\ No newline at end of file